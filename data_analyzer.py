@@ -5,127 +5,144 @@ This script creates basic visualizations and reports for QKD protocols.
 """
 
 import os
-import glob
+import functools
 import numpy as np
-import matplotlib.pyplot as plt
-import pandas as pd
-import networkx as nx
+from matplotlib.figure import Figure
 import warnings
 
+# Resolution for saved PNGs; override with the PLOT_DPI environment variable
+DPI = int(os.environ.get('PLOT_DPI', 150))
+
+# Static topology drawn by create_network_visualization
+NETWORK_NODES = {
+    'Alice': {'pos': (0, 0), 'color': 'blue'},
+    'Bob': {'pos': (10, 0), 'color': 'green'},
+    'QRepeater1': {'pos': (3, 0), 'color': 'cyan'},
+    'QRepeater2': {'pos': (7, 0), 'color': 'cyan'},
+    'Eve': {'pos': (5, 3), 'color': 'red'}
+}
+
+NETWORK_EDGES = [
+    ('Alice', 'QRepeater1'),
+    ('QRepeater1', 'QRepeater2'),
+    ('QRepeater2', 'Bob'),
+    ('Eve', 'QRepeater1'),
+    ('Eve', 'QRepeater2')
+]
+
 def ensure_directory(directory):
     """Ensure the specified directory exists."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
 def create_placeholder_visualizations(output_dir):
     """Create placeholder visualizations."""
+    # One figure is reused for all three charts; drawing through the
+    # Figure API directly keeps pyplot's global state out of the way.
+    fig = Figure(figsize=(10, 6))
+    
     # Create QBR comparison
-    plt.figure(figsize=(10, 6))
+    ax = fig.subplots()
     x = np.arange(3)
     protocols = ["BB84", "B92", "E91"]
     qber_no_eve = [0.05, 0.04, 0.03]
     qber_with_eve = [0.20, 0.18, 0.16]
     
     width = 0.35
-    plt.bar(x - width/2, qber_no_eve, width, label='Without Eavesdropping', color='green')
-    plt.bar(x + width/2, qber_with_eve, width, label='With Eavesdropping', color='red')
+    ax.bar(x - width/2, qber_no_eve, width, label='Without Eavesdropping', color='green')
+    ax.bar(x + width/2, qber_with_eve, width, label='With Eavesdropping', color='red')
     
-    plt.axhline(y=0.15, color='blue', linestyle='--', label='BB84 Threshold (15%)')
-    plt.axhline(y=0.12, color='purple', linestyle='--', label='B92 Threshold (12%)')
+    ax.axhline(y=0.15, color='blue', linestyle='--', label='BB84 Threshold (15%)')
+    ax.axhline(y=0.12, color='purple', linestyle='--', label='B92 Threshold (12%)')
     
-    plt.xlabel('Protocol')
-    plt.ylabel('Quantum Bit Error Rate (QBER)')
-    plt.title('Effect of Eavesdropping on QBER by Protocol')
-    plt.xticks(x, protocols)
-    plt.legend()
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xlabel('Protocol')
+    ax.set_ylabel('Quantum Bit Error Rate (QBER)')
+    ax.set_title('Effect of Eavesdropping on QBER by Protocol')
+    ax.set_xticks(x)
+    ax.set_xticklabels(protocols)
+    ax.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'qber_comparison.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'qber_comparison.png'), dpi=DPI)
+    fig.clear()
     
     # Create key efficiency chart
-    plt.figure(figsize=(10, 6))
+    ax = fig.subplots()
     efficiency_no_eve = [0.5, 0.4, 0.3]
     efficiency_with_eve = [0.5, 0.4, 0.3]
     
-    plt.bar(x - width/2, efficiency_no_eve, width, label='Without Eavesdropping', color='green')
-    plt.bar(x + width/2, efficiency_with_eve, width, label='With Eavesdropping', color='red')
+    ax.bar(x - width/2, efficiency_no_eve, width, label='Without Eavesdropping', color='green')
+    ax.bar(x + width/2, efficiency_with_eve, width, label='With Eavesdropping', color='red')
     
-    plt.xlabel('Protocol')
-    plt.ylabel('Key Generation Efficiency (bits/qubit)')
-    plt.title('Key Generation Efficiency by Protocol')
-    plt.xticks(x, protocols)
-    plt.legend()
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xlabel('Protocol')
+    ax.set_ylabel('Key Generation Efficiency (bits/qubit)')
+    ax.set_title('Key Generation Efficiency by Protocol')
+    ax.set_xticks(x)
+    ax.set_xticklabels(protocols)
+    ax.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'key_efficiency.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'key_efficiency.png'), dpi=DPI)
+    fig.clear()
     
     # Create eavesdropping detection chart
-    plt.figure(figsize=(10, 6))
+    ax = fig.subplots()
     detection = [True, True, True]
     
-    plt.bar(protocols, [100 if d else 0 for d in detection], color='blue')
+    ax.bar(protocols, [100 if d else 0 for d in detection], color='blue')
     
-    plt.xlabel('Protocol')
-    plt.ylabel('Eavesdropping Detection (%)')
-    plt.title('Eavesdropping Detection Capability by Protocol')
-    plt.yticks([0, 25, 50, 75, 100])
-    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    ax.set_xlabel('Protocol')
+    ax.set_ylabel('Eavesdropping Detection (%)')
+    ax.set_title('Eavesdropping Detection Capability by Protocol')
+    ax.set_yticks([0, 25, 50, 75, 100])
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
     for i, d in enumerate(detection):
-        plt.text(i, 50, 'Detected' if d else 'Not Detected', 
+        ax.text(i, 50, 'Detected' if d else 'Not Detected', 
                 ha='center', va='center', color='white', fontweight='bold')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'eavesdropping_detection.png'), dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(os.path.join(output_dir, 'eavesdropping_detection.png'), dpi=DPI)
+    fig.clear()
     
     print("Created placeholder visualizations.")
 
-def create_network_visualization(output_dir):
-    """Create network topology visualization."""
-    # Create a simple network graph
-    G = nx.Graph()
+@functools.lru_cache(maxsize=None)
+def _build_topology():
+    """Build the network topology graph and its drawing layout once."""
+    import networkx as nx
     
-    # Add nodes
-    nodes = {
-        'Alice': {'pos': (0, 0), 'color': 'blue'},
-        'Bob': {'pos': (10, 0), 'color': 'green'},
-        'QRepeater1': {'pos': (3, 0), 'color': 'cyan'},
-        'QRepeater2': {'pos': (7, 0), 'color': 'cyan'},
-        'Eve': {'pos': (5, 3), 'color': 'red'}
-    }
+    G = nx.Graph()
+    pos = {}
+    node_colors = []
     
-    for node, attrs in nodes.items():
+    # Positions and colors are collected in the same pass that adds the nodes
+    for node, attrs in NETWORK_NODES.items():
         G.add_node(node, **attrs)
+        pos[node] = attrs['pos']
+        node_colors.append(attrs['color'])
     
-    # Add edges
-    edges = [
-        ('Alice', 'QRepeater1'),
-        ('QRepeater1', 'QRepeater2'),
-        ('QRepeater2', 'Bob'),
-        ('Eve', 'QRepeater1'),
-        ('Eve', 'QRepeater2')
-    ]
+    G.add_edges_from(NETWORK_EDGES)
     
-    for src, dst in edges:
-        G.add_edge(src, dst)
+    return G, pos, tuple(node_colors)
+
+def create_network_visualization(output_dir):
+    """Create network topology visualization."""
+    import networkx as nx
+    
+    G, pos, node_colors = _build_topology()
     
     # Create visualization
-    plt.figure(figsize=(10, 6))
-    pos = nx.get_node_attributes(G, 'pos')
-    node_colors = [data['color'] for node, data in G.nodes(data=True)]
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
     
-    nx.draw(G, pos, with_labels=True, node_color=node_colors, 
+    nx.draw(G, pos, ax=ax, with_labels=True, node_color=node_colors, 
             node_size=800, font_weight='bold')
     
-    plt.title('Quantum Network Topology')
-    plt.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
-    plt.savefig(os.path.join(output_dir, 'network_topology.png'), dpi=300)
-    plt.close()
+    ax.set_title('Quantum Network Topology')
+    fig.subplots_adjust(left=0.1, right=0.9, top=0.9, bottom=0.1)
+    fig.savefig(os.path.join(output_dir, 'network_topology.png'), dpi=DPI)
     
     print("Created network visualization.")
 
@@ -133,25 +150,30 @@ def create_comparative_report(output_dir):
     """Create a simple comparative report."""
     report_file = os.path.join(output_dir, 'comparative_report.md')
     
-    with open(report_file, 'w') as f:
-        f.write("# Quantum Key Distribution Protocol Comparison\n\n")
+    lines = [
+        "# Quantum Key Distribution Protocol Comparison\n\n",
         
-        f.write("## Overview\n\n")
-        f.write("This report provides a comparison of three main QKD protocols:\n")
-        f.write("- BB84 (Bennett-Brassard 1984)\n")
-        f.write("- B92 (Bennett 1992)\n")
-        f.write("- E91 (Ekert 1991)\n\n")
+        "## Overview\n\n",
+        "This report provides a comparison of three main QKD protocols:\n",
+        "- BB84 (Bennett-Brassard 1984)\n",
+        "- B92 (Bennett 1992)\n",
+        "- E91 (Ekert 1991)\n\n",
         
-        f.write("## Performance Comparison\n\n")
-        f.write("| Protocol | QBER without Eve | QBER with Eve | Key Efficiency | Eavesdropping Detection |\n")
-        f.write("|----------|-----------------|---------------|----------------|-------------------------|\n")
-        f.write("| BB84     | 0.05            | 0.20          | 0.5 bits/qubit | Yes                     |\n")
-        f.write("| B92      | 0.04            | 0.18          | 0.4 bits/qubit | Yes                     |\n")
-        f.write("| E91      | 0.03            | 0.16          | 0.3 bits/qubit | Yes                     |\n\n")
+        "## Performance Comparison\n\n",
+        "| Protocol | QBER without Eve | QBER with Eve | Key Efficiency | Eavesdropping Detection |\n",
+        "|----------|-----------------|---------------|----------------|-------------------------|\n",
+        "| BB84     | 0.05            | 0.20          | 0.5 bits/qubit | Yes                     |\n",
+        "| B92      | 0.04            | 0.18          | 0.4 bits/qubit | Yes                     |\n",
+        "| E91      | 0.03            | 0.16          | 0.3 bits/qubit | Yes                     |\n\n",
         
-        f.write("## Conclusion\n\n")
-        f.write("All QKD protocols successfully detect eavesdropping. BB84 offers the best key generation efficiency, ")
-        f.write("while E91 provides the lowest baseline error rate.\n")
+        "## Conclusion\n\n",
+        "All QKD protocols successfully detect eavesdropping. BB84 offers the best key generation efficiency, ",
+        "while E91 provides the lowest baseline error rate.\n"
+    ]
+    
+    # Write the whole report in one call instead of one write per line
+    with open(report_file, 'w') as f:
+        f.write("".join(lines))
     
     print(f"Created comparative report at {report_file}")
     return report_file
@@ -8,73 +8,154 @@ import sys
 import os
 import re
 import numpy as np
-import matplotlib.pyplot as plt
-from collections import defaultdict
+import pandas as pd
+
+# Resolution for saved PNGs; override with the PLOT_DPI environment variable
+DPI = int(os.environ.get('PLOT_DPI', 150))
+
+# Fields of an NS2 trace line, in file order
+TRACE_COLUMNS = [
+    'event_type',  # + (enqueue), - (dequeue), r (receive), d (drop)
+    'time',
+    'from_node',
+    'to_node',
+    'packet_type',
+    'packet_size',
+    'flags',
+    'flow_id',
+    'src_addr',
+    'dst_addr',
+    'seq_num',
+    'packet_id'
+]
+
+# Event types are stored as int8 codes; unrecognised symbols become -1
+EVENT_TYPES = ['+', '-', 'r', 'd']
+EVENT_ENQUEUE, EVENT_DEQUEUE, EVENT_RECEIVE, EVENT_DROP = range(len(EVENT_TYPES))
+
+# The remaining text fields repeat a handful of values, so they are stored
+# as categoricals (small integer codes) rather than one string per event
+TRACE_STRING_DTYPES = {
+    'event_type': 'category',
+    'packet_type': 'category',
+    'flags': 'category',
+    'src_addr': 'category',
+    'dst_addr': 'category'
+}
+
+TRACE_NUMERIC_DTYPES = {
+    'time': 'float64',
+    'from_node': 'int64',
+    'to_node': 'int64',
+    'packet_size': 'int64',
+    'flow_id': 'int64',
+    'seq_num': 'int64',
+    'packet_id': 'int64'
+}
+
+# Bump when the parsed DataFrame layout changes so stale caches are ignored
+TRACE_CACHE_VERSION = 2
 
 def ensure_directory(directory):
     """Ensure the specified directory exists."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
 def parse_trace_file(file_path):
-    """Parse an NS2 trace file and extract relevant information."""
-    events = []
-    
+    """Parse an NS2 trace file into a DataFrame with one row per event."""
     try:
-        with open(file_path, 'r') as f:
-            for line in f:
-                if line.startswith('#'):
-                    continue
-                    
-                parts = line.strip().split()
-                if len(parts) < 12:
-                    continue
-                
-                event = {
-                    'event_type': parts[0],  # + (enqueue), - (dequeue), r (receive), d (drop)
-                    'time': float(parts[1]),
-                    'from_node': int(parts[2]),
-                    'to_node': int(parts[3]),
-                    'packet_type': parts[4],
-                    'packet_size': int(parts[5]),
-                    'flags': parts[6],
-                    'flow_id': int(parts[7]),
-                    'src_addr': parts[8],
-                    'dst_addr': parts[9],
-                    'seq_num': int(parts[10]),
-                    'packet_id': int(parts[11])
-                }
-                events.append(event)
+        events = pd.read_csv(file_path, sep=r'\s+', comment='#', header=None,
+                             names=TRACE_COLUMNS, usecols=range(len(TRACE_COLUMNS)),
+                             dtype=TRACE_STRING_DTYPES, engine='c')
+        
+        # Lines with fewer than 12 fields come back with a missing packet_id
+        events = events.dropna(subset=['packet_id'])
+        events = events.astype(TRACE_NUMERIC_DTYPES).reset_index(drop=True)
+        events['event_type'] = events['event_type'].cat.set_categories(EVENT_TYPES).cat.codes.astype(np.int8)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame(columns=TRACE_COLUMNS)
     except Exception as e:
         print(f"Error parsing trace file {file_path}: {e}")
-        return []
+        return pd.DataFrame(columns=TRACE_COLUMNS)
+    
+    return events
+
+def _save_trace_cache(events, cache_file):
+    """Save parsed events as plain arrays, with categoricals split into codes and categories."""
+    arrays = {}
+    for column in TRACE_COLUMNS:
+        values = events[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            arrays[f'{column}.codes'] = values.cat.codes.to_numpy()
+            arrays[f'{column}.categories'] = values.cat.categories.to_numpy(dtype=str)
+        else:
+            arrays[column] = values.to_numpy()
+    
+    with open(cache_file, 'wb') as f:
+        np.savez(f, **arrays)
+
+def _load_trace_cache(cache_file):
+    """Rebuild the events DataFrame saved by _save_trace_cache."""
+    # allow_pickle=False keeps a planted cache file from running code on load
+    with np.load(cache_file, allow_pickle=False) as cache:
+        columns = {}
+        for column in TRACE_COLUMNS:
+            if f'{column}.codes' in cache.files:
+                columns[column] = pd.Categorical.from_codes(cache[f'{column}.codes'],
+                                                            cache[f'{column}.categories'].tolist())
+            else:
+                columns[column] = cache[column]
+    
+    return pd.DataFrame(columns, copy=False)
+
+def load_trace(trace_file):
+    """Load trace events, reusing a cached parse if it is newer than the trace."""
+    cache_file = f"{trace_file}.v{TRACE_CACHE_VERSION}.npz"
+    
+    try:
+        if os.path.getmtime(cache_file) > os.path.getmtime(trace_file):
+            return _load_trace_cache(cache_file)
+    except Exception:
+        pass  # No usable cache; fall back to parsing
+    
+    events = parse_trace_file(trace_file)
+    
+    if not events.empty:
+        try:
+            _save_trace_cache(events, cache_file)
+        except Exception as e:
+            print(f"Warning: could not cache parsed trace to {cache_file}: {e}")
     
     return events
 
 def calculate_throughput(events, interval=0.1):
     """Calculate throughput over time."""
-    # Group events by time interval
-    throughput_data = defaultdict(int)
-    max_time = max(event['time'] for event in events)
+    max_time = events['time'].max()
     intervals = np.arange(0, max_time + interval, interval)
     
-    # Sum packet sizes for received packets
-    for event in events:
-        if event['event_type'] == 'r':  # received packet
-            interval_idx = int(event['time'] / interval)
-            if interval_idx < len(intervals):
-                throughput_data[intervals[interval_idx]] += event['packet_size']
+    # Bin received packets by time interval
+    received = events['event_type'].to_numpy() == EVENT_RECEIVE
+    interval_idx = (events['time'].to_numpy()[received] / interval).astype(np.int64)
+    packet_sizes = events['packet_size'].to_numpy()[received]
+    
+    in_range = interval_idx < len(intervals)
+    interval_idx = interval_idx[in_range]
+    packet_sizes = packet_sizes[in_range]
+    
+    # Sum packet sizes per interval, keeping only intervals that saw a receive
+    bytes_per_interval = np.bincount(interval_idx, weights=packet_sizes)
+    active = np.flatnonzero(np.bincount(interval_idx))
     
     # Convert to bits per second
-    times = sorted(throughput_data.keys())
-    throughput = [(throughput_data[t] * 8) / interval for t in times]  # Convert bytes to bits
+    times = intervals[active]
+    throughput = bytes_per_interval[active] * 8 / interval  # Convert bytes to bits
     
     return times, throughput
 
 def calculate_packet_loss(events):
     """Calculate packet loss ratio."""
-    packets_sent = sum(1 for event in events if event['event_type'] == '+')
-    packets_dropped = sum(1 for event in events if event['event_type'] == 'd')
+    event_type = events['event_type'].to_numpy()
+    packets_sent = int(np.count_nonzero(event_type == EVENT_ENQUEUE))
+    packets_dropped = int(np.count_nonzero(event_type == EVENT_DROP))
     
     if packets_sent == 0:
         return 0
@@ -83,96 +164,123 @@ def calculate_packet_loss(events):
 
 def calculate_end_to_end_delay(events):
     """Calculate end-to-end delay for packets."""
-    # Track packet send and receive times
-    packet_times = {}
-    delays = []
-    
-    for event in events:
-        packet_id = event['packet_id']
-        
-        if event['event_type'] == '+' and event['from_node'] == 0:  # Packet sent from source
-            packet_times[packet_id] = event['time']
-        
-        elif event['event_type'] == 'r' and event['to_node'] == 1:  # Packet received at destination
-            if packet_id in packet_times:
-                delay = event['time'] - packet_times[packet_id]
-                delays.append(delay)
-    
-    return delays
+    event_type = events['event_type']
+    is_sent = ((event_type == EVENT_ENQUEUE) & (events['from_node'] == 0)).to_numpy()  # Packet sent from source
+    is_received = ((event_type == EVENT_RECEIVE) & (events['to_node'] == 1)).to_numpy()  # Packet received at destination
+    
+    position = np.arange(len(events))
+    packet_ids = events['packet_id'].to_numpy()
+    times = events['time'].to_numpy()
+    
+    sends = pd.DataFrame({'position': position[is_sent],
+                          'packet_id': packet_ids[is_sent],
+                          'send_time': times[is_sent]})
+    receives = pd.DataFrame({'position': position[is_received],
+                             'packet_id': packet_ids[is_received],
+                             'receive_time': times[is_received]})
+    
+    # Pair each receive with the latest earlier send of the same packet
+    matched = pd.merge_asof(receives, sends, on='position', by='packet_id',
+                            direction='backward')
+    delays = (matched['receive_time'] - matched['send_time']).dropna()
+    
+    return delays.to_numpy()
 
 def analyze_node_activity(events):
     """Analyze activity at each node."""
-    node_activity = defaultdict(lambda: {'sent': 0, 'received': 0, 'dropped': 0})
+    event_type = events['event_type'].to_numpy()
     
-    for event in events:
-        if event['event_type'] == '+':  # Packet sent
-            node_activity[event['from_node']]['sent'] += 1
-        
-        elif event['event_type'] == 'r':  # Packet received
-            node_activity[event['to_node']]['received'] += 1
-        
-        elif event['event_type'] == 'd':  # Packet dropped
-            node_activity[event['from_node']]['dropped'] += 1
+    node_activity = pd.DataFrame({
+        'sent': events.loc[event_type == EVENT_ENQUEUE, 'from_node'].value_counts(),  # Packet sent
+        'received': events.loc[event_type == EVENT_RECEIVE, 'to_node'].value_counts(),  # Packet received
+        'dropped': events.loc[event_type == EVENT_DROP, 'from_node'].value_counts()  # Packet dropped
+    }).fillna(0).astype(int)
     
-    return node_activity
+    return node_activity.to_dict('index')
 
 def analyze_queueing_delay(events):
     """Calculate queueing delay at each node."""
-    queue_times = {}  # (node, packet_id) -> enqueue_time
-    queue_delays = defaultdict(list)
-    
-    for event in events:
-        node = event['from_node']
-        packet_id = event['packet_id']
-        
-        if event['event_type'] == '+':  # Packet enqueued
-            queue_times[(node, packet_id)] = event['time']
-        
-        elif event['event_type'] == '-':  # Packet dequeued
-            if (node, packet_id) in queue_times:
-                delay = event['time'] - queue_times[(node, packet_id)]
-                queue_delays[node].append(delay)
+    event_type = events['event_type']
+    is_enqueued = (event_type == EVENT_ENQUEUE).to_numpy()  # Packet enqueued
+    is_dequeued = (event_type == EVENT_DEQUEUE).to_numpy()  # Packet dequeued
+    
+    position = np.arange(len(events))
+    nodes = events['from_node'].to_numpy()
+    packet_ids = events['packet_id'].to_numpy()
+    times = events['time'].to_numpy()
+    
+    enqueues = pd.DataFrame({'position': position[is_enqueued],
+                             'node': nodes[is_enqueued],
+                             'packet_id': packet_ids[is_enqueued],
+                             'enqueue_time': times[is_enqueued]})
+    dequeues = pd.DataFrame({'position': position[is_dequeued],
+                             'node': nodes[is_dequeued],
+                             'packet_id': packet_ids[is_dequeued],
+                             'dequeue_time': times[is_dequeued]})
+    
+    # Pair each dequeue with the latest earlier enqueue of the packet at that node
+    matched = pd.merge_asof(dequeues, enqueues, on='position', by=['node', 'packet_id'],
+                            direction='backward')
+    matched['delay'] = matched['dequeue_time'] - matched['enqueue_time']
+    matched = matched.dropna(subset=['delay'])
     
     # Calculate average queueing delay per node
-    avg_queue_delays = {}
-    for node, delays in queue_delays.items():
-        if delays:
-            avg_queue_delays[node] = sum(delays) / len(delays)
-        else:
-            avg_queue_delays[node] = 0
+    avg_queue_delays = matched.groupby('node')['delay'].mean().to_dict()
     
     return avg_queue_delays
 
+# Figure shared by all plots; created on first use and cleared between plots
+_figure = None
+
+def get_plot_axes(figsize):
+    """Return fresh axes on the shared figure, resized to figsize."""
+    global _figure
+    if _figure is None:
+        # Imported here so runs that exit before plotting never load matplotlib
+        from matplotlib.figure import Figure
+        _figure = Figure()
+    
+    _figure.clear()
+    _figure.set_size_inches(figsize)
+    return _figure, _figure.add_subplot()
+
 def plot_throughput(times, throughput, output_path):
     """Plot throughput over time."""
-    plt.figure(figsize=(10, 6))
-    plt.plot(times, throughput, 'b-')
-    plt.xlabel('Time (s)')
-    plt.ylabel('Throughput (bits/s)')
-    plt.title('Network Throughput Over Time')
-    plt.grid(True)
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    fig, ax = get_plot_axes((10, 6))
+    ax.plot(times, throughput, 'b-')
+    ax.set_xlabel('Time (s)')
+    ax.set_ylabel('Throughput (bits/s)')
+    ax.set_title('Network Throughput Over Time')
+    ax.grid(True)
+    
+    # Long traces give thousands of points; merge near-collinear vertices when drawing
+    import matplotlib
+    with matplotlib.rc_context({'path.simplify': True, 'path.simplify_threshold': 1.0}):
+        fig.savefig(output_path, dpi=DPI)
 
 def plot_delay_histogram(delays, output_path):
     """Plot histogram of packet delays."""
-    plt.figure(figsize=(10, 6))
-    plt.hist(delays, bins=20, alpha=0.7, color='blue', edgecolor='black')
-    plt.xlabel('Delay (s)')
-    plt.ylabel('Number of Packets')
-    plt.title('End-to-End Packet Delay Distribution')
-    plt.grid(True, axis='y', linestyle='--', alpha=0.7)
+    delays_arr = np.asarray(delays, dtype=np.float64)
+    counts, edges = np.histogram(delays_arr, bins=20)
+    
+    fig, ax = get_plot_axes((10, 6))
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge',
+           alpha=0.7, color='blue', edgecolor='black')
+    ax.set_xlabel('Delay (s)')
+    ax.set_ylabel('Number of Packets')
+    ax.set_title('End-to-End Packet Delay Distribution')
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
     
     # Add mean and median information
-    if delays:
-        mean_delay = sum(delays) / len(delays)
-        median_delay = sorted(delays)[len(delays)//2]
-        plt.axvline(mean_delay, color='r', linestyle='dashed', linewidth=2, label=f'Mean: {mean_delay:.3f}s')
-        plt.axvline(median_delay, color='g', linestyle='dashed', linewidth=2, label=f'Median: {median_delay:.3f}s')
-        plt.legend()
-    
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    if len(delays_arr):
+        mean_delay = delays_arr.mean()
+        # Upper median without a full sort
+        median_delay = np.partition(delays_arr, len(delays_arr)//2)[len(delays_arr)//2]
+        ax.axvline(mean_delay, color='r', linestyle='dashed', linewidth=2, label=f'Mean: {mean_delay:.3f}s')
+        ax.axvline(median_delay, color='g', linestyle='dashed', linewidth=2, label=f'Median: {median_delay:.3f}s')
+        ax.legend()
+    
+    fig.savefig(output_path, dpi=DPI)
 
 def plot_node_activity(node_activity, output_path):
     """Plot node activity statistics."""
@@ -181,55 +289,51 @@ def plot_node_activity(node_activity, output_path):
     received = [node_activity[node]['received'] for node in nodes]
     dropped = [node_activity[node]['dropped'] for node in nodes]
     
-    plt.figure(figsize=(12, 7))
+    fig, ax = get_plot_axes((12, 7))
     
     x = np.arange(len(nodes))
     width = 0.25
     
-    plt.bar(x - width, sent, width, label='Packets Sent', color='blue')
-    plt.bar(x, received, width, label='Packets Received', color='green')
-    plt.bar(x + width, dropped, width, label='Packets Dropped', color='red')
+    ax.bar(x - width, sent, width, label='Packets Sent', color='blue')
+    ax.bar(x, received, width, label='Packets Received', color='green')
+    ax.bar(x + width, dropped, width, label='Packets Dropped', color='red')
     
-    plt.xlabel('Node ID')
-    plt.ylabel('Number of Packets')
-    plt.title('Node Activity Statistics')
-    plt.xticks(x, [f'Node {node}' for node in nodes])
-    plt.legend()
-    plt.grid(True, axis='y', linestyle='--', alpha=0.7)
+    ax.set_xlabel('Node ID')
+    ax.set_ylabel('Number of Packets')
+    ax.set_title('Node Activity Statistics')
+    ax.set_xticks(x)
+    ax.set_xticklabels([f'Node {node}' for node in nodes])
+    ax.legend()
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
     
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=DPI)
 
 def plot_queue_delays(queue_delays, output_path):
     """Plot average queueing delay at each node."""
     nodes = sorted(queue_delays.keys())
     delays = [queue_delays[node] * 1000 for node in nodes]  # Convert to milliseconds
     
-    plt.figure(figsize=(10, 6))
-    plt.bar(range(len(nodes)), delays, color='purple')
-    plt.xlabel('Node ID')
-    plt.ylabel('Average Queueing Delay (ms)')
-    plt.title('Average Queueing Delay by Node')
-    plt.xticks(range(len(nodes)), [f'Node {node}' for node in nodes])
-    plt.grid(True, axis='y', linestyle='--', alpha=0.7)
-    
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=300)
-    plt.close()
+    fig, ax = get_plot_axes((10, 6))
+    ax.bar(range(len(nodes)), delays, color='purple')
+    ax.set_xlabel('Node ID')
+    ax.set_ylabel('Average Queueing Delay (ms)')
+    ax.set_title('Average Queueing Delay by Node')
+    ax.set_xticks(range(len(nodes)))
+    ax.set_xticklabels([f'Node {node}' for node in nodes])
+    ax.grid(True, axis='y', linestyle='--', alpha=0.7)
+    
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=DPI)
 
 def analyze_protocol_overhead(events):
     """Analyze overhead caused by protocol control packets."""
-    data_packets = 0
-    control_packets = 0
-    
-    for event in events:
-        if event['event_type'] == '+':  # Only count sent packets
-            if event['packet_type'] == 'tcp':
-                data_packets += 1
-            else:
-                # Assuming all non-TCP packets are control packets
-                control_packets += 1
+    # Only count sent packets
+    sent_types = events['packet_type'][events['event_type'].to_numpy() == EVENT_ENQUEUE]
+    # Compare on the categorical itself so pandas matches codes, not strings
+    data_packets = int((sent_types == 'tcp').sum())
+    # Assuming all non-TCP packets are control packets
+    control_packets = len(sent_types) - data_packets
     
     total_packets = data_packets + control_packets
     if total_packets == 0:
@@ -237,6 +341,16 @@ def analyze_protocol_overhead(events):
     
     return (control_packets / total_packets) * 100  # Return as percentage
 
+def write_report(output_file, lines):
+    """Write the stats report header and body lines in a single write."""
+    header = [
+        "=================================================\n",
+        "Network Performance Analysis for QKD Simulation\n",
+        "=================================================\n\n"
+    ]
+    with open(output_file, 'w') as f:
+        f.write("".join(header + lines))
+
 def main():
     if len(sys.argv) < 3:
         print("Usage: network_analyzer.py trace_file.tr output_stats.txt")
@@ -253,26 +367,22 @@ def main():
     if not os.path.exists(trace_file):
         print(f"Error: Trace file '{trace_file}' does not exist.")
         # Generate empty output file with error message
-        with open(output_file, 'w') as f:
-            f.write("=================================================\n")
-            f.write("Network Performance Analysis for QKD Simulation\n")
-            f.write("=================================================\n\n")
-            f.write(f"ERROR: Trace file '{trace_file}' does not exist.\n")
-            f.write("Please run the network simulation first to generate trace files.\n")
+        write_report(output_file, [
+            f"ERROR: Trace file '{trace_file}' does not exist.\n",
+            "Please run the network simulation first to generate trace files.\n"
+        ])
         return
     
     # Parse the trace file
     print(f"Parsing trace file: {trace_file}")
-    events = parse_trace_file(trace_file)
+    events = load_trace(trace_file)
     
-    if not events:
+    if events.empty:
         print("No events found in trace file or file format is incorrect.")
         # Generate empty output file with error message
-        with open(output_file, 'w') as f:
-            f.write("=================================================\n")
-            f.write("Network Performance Analysis for QKD Simulation\n")
-            f.write("=================================================\n\n")
-            f.write("ERROR: No events found in trace file or file format is incorrect.\n")
+        write_report(output_file, [
+            "ERROR: No events found in trace file or file format is incorrect.\n"
+        ])
         return
     
     # Calculate performance metrics
@@ -287,10 +397,10 @@ def main():
     
         # Generate visualizations
         print("Generating visualizations...")
-        if times and throughput:
+        if len(throughput):
             plot_throughput(times, throughput, os.path.join(graphs_dir, 'throughput.png'))
         
-        if delays:
+        if len(delays):
             plot_delay_histogram(delays, os.path.join(graphs_dir, 'delay_histogram.png'))
         
         plot_node_activity(node_activity, os.path.join(graphs_dir, 'node_activity.png'))
@@ -298,65 +408,60 @@ def main():
         
         # Write statistics to output file
         print(f"Writing statistics to: {output_file}")
-        with open(output_file, 'w') as f:
-            f.write("=================================================\n")
-            f.write("Network Performance Analysis for QKD Simulation\n")
-            f.write("=================================================\n\n")
-            
-            f.write("1. Basic Statistics:\n")
-            f.write(f"   Total events processed: {len(events)}\n")
-            f.write(f"   Simulation duration: {max(event['time'] for event in events):.2f} seconds\n")
-            f.write(f"   Number of active nodes: {len(node_activity)}\n\n")
-            
-            f.write("2. Performance Metrics:\n")
-            
-            if times and throughput:
-                avg_throughput = sum(throughput) / len(throughput)
-                peak_throughput = max(throughput)
-                f.write(f"   Average throughput: {avg_throughput:.2f} bits/s\n")
-                f.write(f"   Peak throughput: {peak_throughput:.2f} bits/s\n")
-            
-            f.write(f"   Packet loss ratio: {packet_loss_ratio:.2%}\n")
-            
-            if delays:
-                avg_delay = sum(delays) / len(delays)
-                min_delay = min(delays)
-                max_delay = max(delays)
-                jitter = np.std(delays) if len(delays) > 1 else 0
-                
-                f.write(f"   Average end-to-end delay: {avg_delay:.4f} seconds\n")
-                f.write(f"   Minimum delay: {min_delay:.4f} seconds\n")
-                f.write(f"   Maximum delay: {max_delay:.4f} seconds\n")
-                f.write(f"   Delay jitter: {jitter:.4f} seconds\n")
-            
-            f.write(f"   Protocol overhead: {protocol_overhead:.2f}%\n\n")
-            
-            f.write("3. Node Activity:\n")
-            for node, stats in sorted(node_activity.items()):
-                f.write(f"   Node {node}:\n")
-                f.write(f"     Packets sent: {stats['sent']}\n")
-                f.write(f"     Packets received: {stats['received']}\n")
-                f.write(f"     Packets dropped: {stats['dropped']}\n")
-                if stats['sent'] > 0:
-                    drop_ratio = stats['dropped'] / stats['sent']
-                    f.write(f"     Drop ratio: {drop_ratio:.2%}\n")
-                f.write("\n")
-            
-            f.write("4. Queueing Analysis:\n")
-            for node, delay in sorted(queue_delays.items()):
-                f.write(f"   Node {node} average queueing delay: {delay*1000:.2f} ms\n")
+        lines = []
+        
+        lines.append("1. Basic Statistics:\n")
+        lines.append(f"   Total events processed: {len(events)}\n")
+        lines.append(f"   Simulation duration: {events['time'].max():.2f} seconds\n")
+        lines.append(f"   Number of active nodes: {len(node_activity)}\n\n")
+        
+        lines.append("2. Performance Metrics:\n")
+        
+        if len(throughput):
+            avg_throughput = throughput.mean()
+            peak_throughput = throughput.max()
+            lines.append(f"   Average throughput: {avg_throughput:.2f} bits/s\n")
+            lines.append(f"   Peak throughput: {peak_throughput:.2f} bits/s\n")
+        
+        lines.append(f"   Packet loss ratio: {packet_loss_ratio:.2%}\n")
+        
+        if len(delays):
+            avg_delay = delays.mean()
+            min_delay = delays.min()
+            max_delay = delays.max()
+            jitter = delays.std() if len(delays) > 1 else 0
             
-            f.write("\n=================================================\n")
-            f.write("Analysis complete. See 'graphs/network/' directory for visualizations.\n")
+            lines.append(f"   Average end-to-end delay: {avg_delay:.4f} seconds\n")
+            lines.append(f"   Minimum delay: {min_delay:.4f} seconds\n")
+            lines.append(f"   Maximum delay: {max_delay:.4f} seconds\n")
+            lines.append(f"   Delay jitter: {jitter:.4f} seconds\n")
+        
+        lines.append(f"   Protocol overhead: {protocol_overhead:.2f}%\n\n")
+        
+        lines.append("3. Node Activity:\n")
+        for node, stats in sorted(node_activity.items()):
+            lines.append(f"   Node {node}:\n")
+            lines.append(f"     Packets sent: {stats['sent']}\n")
+            lines.append(f"     Packets received: {stats['received']}\n")
+            lines.append(f"     Packets dropped: {stats['dropped']}\n")
+            if stats['sent'] > 0:
+                drop_ratio = stats['dropped'] / stats['sent']
+                lines.append(f"     Drop ratio: {drop_ratio:.2%}\n")
+            lines.append("\n")
+        
+        lines.append("4. Queueing Analysis:\n")
+        for node, delay in sorted(queue_delays.items()):
+            lines.append(f"   Node {node} average queueing delay: {delay*1000:.2f} ms\n")
+        
+        lines.append("\n=================================================\n")
+        lines.append("Analysis complete. See 'graphs/network/' directory for visualizations.\n")
+        
+        write_report(output_file, lines)
     
     except Exception as e:
         print(f"Error during analysis: {e}")
         # Write error to output file
-        with open(output_file, 'w') as f:
-            f.write("=================================================\n")
-            f.write("Network Performance Analysis for QKD Simulation\n")
-            f.write("=================================================\n\n")
-            f.write(f"ERROR during analysis: {e}\n")
+        write_report(output_file, [f"ERROR during analysis: {e}\n"])
     
     print("Analysis complete!")
 
@@ -5,16 +5,38 @@ This script processes QKD protocol simulation results and generates visualizatio
 """
 
 import sys
+import functools
+import copy
 import re
+import mmap
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.ticker import PercentFormatter
 import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Resolution for saved PNGs; override with the PLOT_DPI environment variable
+DPI = int(os.environ.get('PLOT_DPI', 150))
+
+# Each "Eavesdropping: " marker starts a new experiment in a protocol log.
+# The patterns are bytes so they can run directly over a memory-mapped log,
+# and each starts with a literal so re can skip ahead with its prefix search.
+EVE_MARKER = b"Eavesdropping: "
+ABORTED_MARKER = b"Protocol ABORTED"
+ACTIVE_RE = re.compile(rb"\s*Active")
+QBER_RE = re.compile(rb"Quantum Bit Error Rate \(QBER\): ([0-9.]+)")
+RAW_KEY_RE = re.compile(rb"raw key length: (\d+) bits")
+# The label may or may not carry a suffix ("after privacy amplification"),
+# but never crosses a colon or a line break and is at most 120 characters
+FINAL_KEY_RE = re.compile(rb"Final secure key length[^:\n]{0,120}: (\d+) bits")
+
+# Headers of the comparison log sections; the table rows inside are split on '|'
+NO_EVE_HEADER = "--- Performance Without Eavesdropping ---\n"
+WITH_EVE_HEADER = "--- Performance With Eavesdropping ---\n"
 
 def ensure_directory(directory):
     """Ensure the specified directory exists."""
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+    os.makedirs(directory, exist_ok=True)
 
 def extract_metrics(filename):
     """Extract key metrics from the protocol log file."""
@@ -28,48 +50,98 @@ def extract_metrics(filename):
     }
     
     try:
-        with open(filename, 'r') as f:
-            content = f.read()
+        with open(filename, 'rb') as f:
+            # mmap cannot map an empty file, and there is nothing to parse anyway
+            if os.fstat(f.fileno()).st_size == 0:
+                return metrics
             
-            # Extract experiment configurations
-            eavesdropping_sections = content.split("Eavesdropping: ")
-            for i, section in enumerate(eavesdropping_sections[1:], 1):
-                is_eavesdropping = section.strip().startswith("Active")
-                metrics['eavesdropping'].append(is_eavesdropping)
-                
-                # Extract QBER
-                qber_match = re.search(r"Quantum Bit Error Rate \(QBER\): ([0-9.]+)", section)
-                if qber_match:
-                    metrics['qber'].append(float(qber_match.group(1)))
-                else:
-                    metrics['qber'].append(0.0)  # Default value if not found
-                
-                # Extract key lengths
-                raw_key_match = re.search(r"raw key length: (\d+) bits", section)
-                if raw_key_match:
-                    metrics['key_length'].append(int(raw_key_match.group(1)))
-                else:
-                    metrics['key_length'].append(0)  # Default value if not found
-                
-                final_key_match = re.search(r"Final secure key length.+?: (\d+) bits", section)
-                if final_key_match:
-                    metrics['final_key_length'].append(int(final_key_match.group(1)))
-                else:
-                    metrics['final_key_length'].append(0)  # Default value if not found
-                
-                # Extract success
-                if "Protocol ABORTED" in section:
-                    metrics['success'].append(False)
-                else:
-                    metrics['success'].append(True)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                start = content.find(EVE_MARKER)
+                while start != -1:
+                    # Search each experiment in place, between its marker and the next
+                    start += len(EVE_MARKER)
+                    end = content.find(EVE_MARKER, start)
+                    stop = len(content) if end == -1 else end
+                    
+                    metrics['eavesdropping'].append(ACTIVE_RE.match(content, start, stop) is not None)
+                    
+                    qber_match = QBER_RE.search(content, start, stop)
+                    metrics['qber'].append(float(qber_match[1]) if qber_match else 0.0)
+                    
+                    raw_key_match = RAW_KEY_RE.search(content, start, stop)
+                    metrics['key_length'].append(int(raw_key_match[1]) if raw_key_match else 0)
+                    
+                    final_key_match = FINAL_KEY_RE.search(content, start, stop)
+                    metrics['final_key_length'].append(int(final_key_match[1]) if final_key_match else 0)
+                    
+                    metrics['success'].append(content.find(ABORTED_MARKER, start, stop) == -1)
+                    start = end
     
     except Exception as e:
         print(f"Error processing {filename}: {e}")
         
     return metrics
 
+def _find_section(content, header):
+    """Return the text between header and the next line starting with '---', or None."""
+    start = content.find(header)
+    if start == -1:
+        return None
+    
+    start += len(header)
+    # Search from the header's own newline so an empty section is found too
+    end = content.find("\n---", start - 1)
+    if end == -1:
+        return None
+    
+    return content[start:end + 1]
+
+def _parse_table_rows(section, convert_last=str):
+    """Yield (protocol, success, qber, raw_key, final_key, last_column) per table row.
+    
+    convert_last is applied to the last column; rows where any conversion fails are skipped.
+    """
+    for line in section.splitlines():
+        # Outer pipes ("| BB84 | Yes | ... |") would otherwise leave empty edge cells
+        cols = [col.strip() for col in line.strip().strip('|').split('|')]
+        
+        # Skip the header and anything else that is not a data row
+        if len(cols) < 6 or cols[1] not in ('Yes', 'No'):
+            continue
+        
+        try:
+            row = (cols[0], cols[1] == 'Yes', float(cols[2]), int(cols[3]), int(cols[4]),
+                   convert_last(cols[5]))
+        except ValueError:
+            continue
+        
+        yield row
+
+def _as_arrays(data):
+    """Convert the per-protocol value lists of comparison data to numpy arrays."""
+    for bucket in ('no_eve', 'with_eve'):
+        for key, values in data[bucket].items():
+            data[bucket][key] = np.asarray(values)
+    return data
+
 def extract_comparison_data(comparison_file):
     """Extract comparison data from the comparison log file."""
+    try:
+        stat = os.stat(comparison_file)
+    except OSError:
+        return _parse_comparison_data(comparison_file)  # Reports the missing file
+    
+    # Reuse the parse while the file is unchanged; hand out a copy so callers
+    # cannot modify the cached data
+    return copy.deepcopy(_load_comparison_data(comparison_file, stat.st_mtime_ns, stat.st_size))
+
+@functools.lru_cache(maxsize=16)
+def _load_comparison_data(comparison_file, mtime_ns, size):
+    """Parse comparison_file; mtime_ns and size only key the cache."""
+    return _parse_comparison_data(comparison_file)
+
+def _parse_comparison_data(comparison_file):
+    """Parse the comparison log file, falling back to default values."""
     data = {
         'protocols': [],
         'no_eve': {
@@ -109,18 +181,15 @@ def extract_comparison_data(comparison_file):
     try:
         if not os.path.exists(comparison_file):
             print(f"Warning: Comparison file {comparison_file} not found. Using default values.")
-            return data
+            return _as_arrays(data)
             
         with open(comparison_file, 'r') as f:
             content = f.read()
             
             # Get the without eavesdropping section
-            no_eve_match = re.search(r"--- Performance Without Eavesdropping ---\n(.*?)---", 
-                                     content, re.DOTALL)
-            if no_eve_match:
-                no_eve_section = no_eve_match.group(1)
-                protocol_lines = re.findall(r"(\w+)\s+\|\s+(Yes|No)\s+\|\s+([0-9.]+)\s+\|\s+([0-9]+)\s+\|\s+([0-9]+)\s+\|\s+([0-9.]+)", 
-                                           no_eve_section)
+            no_eve_section = _find_section(content, NO_EVE_HEADER)
+            if no_eve_section is not None:
+                protocol_lines = _parse_table_rows(no_eve_section, lambda cell: float(cell.strip('%')))
                 
                 # Reset data from defaults
                 data['protocols'] = []
@@ -132,19 +201,16 @@ def extract_comparison_data(comparison_file):
                 
                 for line in protocol_lines:
                     data['protocols'].append(line[0])
-                    data['no_eve']['success'].append(line[1] == 'Yes')
-                    data['no_eve']['qber'].append(float(line[2]))
-                    data['no_eve']['raw_key'].append(int(line[3]))
-                    data['no_eve']['final_key'].append(int(line[4]))
-                    data['no_eve']['efficiency'].append(float(line[5].strip('%')))
+                    data['no_eve']['success'].append(line[1])
+                    data['no_eve']['qber'].append(line[2])
+                    data['no_eve']['raw_key'].append(line[3])
+                    data['no_eve']['final_key'].append(line[4])
+                    data['no_eve']['efficiency'].append(line[5])
             
             # Get the with eavesdropping section
-            with_eve_match = re.search(r"--- Performance With Eavesdropping ---\n(.*?)---", 
-                                      content, re.DOTALL)
-            if with_eve_match:
-                with_eve_section = with_eve_match.group(1)
-                protocol_lines = re.findall(r"(\w+)\s+\|\s+(Yes|No)\s+\|\s+([0-9.]+)\s+\|\s+([0-9]+)\s+\|\s+([0-9]+)\s+\|\s+(\w+)", 
-                                           with_eve_section)
+            with_eve_section = _find_section(content, WITH_EVE_HEADER)
+            if with_eve_section is not None:
+                protocol_lines = _parse_table_rows(with_eve_section)
                 
                 # Reset data from defaults if we have protocols defined
                 if data['protocols']:
@@ -162,336 +228,242 @@ def extract_comparison_data(comparison_file):
                         data['with_eve']['final_key'].append(0)
                         data['with_eve']['detection'].append(True)
                 
-                for i, line in enumerate(protocol_lines):
-                    protocol = line[0]
-                    if protocol in data['protocols']:
-                        idx = data['protocols'].index(protocol)
-                        data['with_eve']['success'][idx] = (line[1] == 'Yes')
-                        data['with_eve']['qber'][idx] = float(line[2])
-                        data['with_eve']['raw_key'][idx] = int(line[3])
-                        data['with_eve']['final_key'][idx] = int(line[4])
+                # Row position of each protocol (first one wins if a name repeats)
+                protocol_index = {}
+                for idx, protocol in enumerate(data['protocols']):
+                    protocol_index.setdefault(protocol, idx)
+                
+                for line in protocol_lines:
+                    idx = protocol_index.get(line[0])
+                    if idx is not None:
+                        data['with_eve']['success'][idx] = line[1]
+                        data['with_eve']['qber'][idx] = line[2]
+                        data['with_eve']['raw_key'][idx] = line[3]
+                        data['with_eve']['final_key'][idx] = line[4]
                         data['with_eve']['detection'][idx] = (line[5] == 'Detected')
     
     except Exception as e:
         print(f"Error processing comparison file: {e}")
         print("Using default values for plots.")
         
-    return data
+    return _as_arrays(data)
 
-def plot_qber_comparison(comparison_data, output_dir):
-    """Plot QBER comparison with and without eavesdropping."""
-    plt.figure(figsize=(10, 6))
+# Shared plot settings
+BAR_WIDTH = 0.35  # Width of each bar in the paired with/without-eavesdropping charts
+BAR_COLORS = ['blue', 'orange', 'green']
+RADAR_COLORS = ['blue', 'red', 'green', 'purple', 'orange']
+QBER_THRESHOLDS = [
+    (0.15, 'orange', 'BB84 Threshold (15%)'),
+    (0.12, 'cyan', 'B92 Threshold (12%)')
+]
+
+# Radar chart axes, with the first angle repeated to close each polygon
+RADAR_CATEGORIES = ['Key Efficiency', 'Eve Detection', 'Implementation\nSimplicity', 
+                    'Quantum Resource\nEfficiency', 'Error Tolerance']
+RADAR_ANGLES = np.concatenate([np.linspace(0, 2*np.pi, len(RADAR_CATEGORIES), endpoint=False), [0.0]])
+
+# Fixed subplot margins for the 10x6 bar charts and the 10x8 radar chart
+BAR_MARGINS = dict(left=0.08, right=0.98, top=0.92, bottom=0.1)
+RADAR_MARGINS = dict(left=0.02, right=0.98, top=0.93, bottom=0.04)
+
+_figure = None
+
+def get_plot_axes(figsize, polar=False):
+    """Return fresh axes on the shared figure, resized to figsize."""
+    global _figure
+    if _figure is None:
+        _figure = Figure()
+    
+    _figure.clear()
+    _figure.set_size_inches(figsize)
+    return _figure, _figure.add_subplot(polar=polar)
+
+def _paired_bar(ax, protocols, without_eve, with_eve, ylabel, title):
+    """Draw side-by-side without/with eavesdropping bars for each protocol."""
+    x = np.arange(len(protocols))
+    
+    ax.bar(x - BAR_WIDTH/2, without_eve, BAR_WIDTH, label='Without Eavesdropping', color='green')
+    
+    # Only plot with_eve if we have one value per protocol
+    if len(with_eve) == len(protocols):
+        ax.bar(x + BAR_WIDTH/2, with_eve, BAR_WIDTH, label='With Eavesdropping', color='red')
+    
+    ax.set_xlabel('Protocol')
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.set_xticks(x, protocols)
+    ax.legend()
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
+
+def _safe_plot(draw, comparison_data, output_path, name, no_data_title,
+               figsize=(10, 6), margins=BAR_MARGINS, polar=False):
+    """Draw a chart with draw(ax, comparison_data) and save it to output_path.
     
+    Falls back to the shared no-data and error placeholders when there is nothing
+    to plot or drawing fails.
+    """
     # Make sure we have protocols to plot
     if not comparison_data['protocols']:
-        print("Warning: No protocols found for QBER comparison plot")
-        plt.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
-        plt.title('QBER Comparison (No Data)')
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'qber_comparison.png'), dpi=300)
-        plt.close()
+        print(f"Warning: No protocols found for {name}")
+        fig, ax = get_plot_axes(figsize)
+        ax.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
+        ax.set_title(no_data_title)
+        fig.subplots_adjust(**margins)
+        fig.savefig(output_path, dpi=DPI)
         return
     
     try:
-        x = np.arange(len(comparison_data['protocols']))
-        width = 0.35
-        
-        # Plot no_eve data
-        plt.bar(x - width/2, comparison_data['no_eve']['qber'], width, 
-                label='Without Eavesdropping', color='green')
-        
-        # Plot with_eve data only if we have the same number of elements
-        if len(comparison_data['with_eve']['qber']) == len(comparison_data['protocols']):
-            plt.bar(x + width/2, comparison_data['with_eve']['qber'], width, 
-                    label='With Eavesdropping', color='red')
-        
-        plt.xlabel('Protocol')
-        plt.ylabel('Quantum Bit Error Rate (QBER)')
-        plt.title('Effect of Eavesdropping on QBER')
-        plt.xticks(x, comparison_data['protocols'])
-        plt.legend()
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        # Add threshold lines
-        plt.axhline(y=0.15, color='orange', linestyle='--', label='BB84 Threshold (15%)')
-        plt.axhline(y=0.12, color='cyan', linestyle='--', label='B92 Threshold (12%)')
-        plt.legend()
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'qber_comparison.png'), dpi=300)
+        fig, ax = get_plot_axes(figsize, polar=polar)
+        draw(ax, comparison_data)
+        fig.subplots_adjust(**margins)
+        fig.savefig(output_path, dpi=DPI)
     except Exception as e:
-        print(f"Error creating QBER comparison plot: {e}")
-        plt.clf()
-        plt.text(0.5, 0.5, f"Error creating plot: {e}", ha='center', va='center')
-        plt.savefig(os.path.join(output_dir, 'qber_comparison.png'), dpi=300)
+        print(f"Error creating {name}: {e}")
+        fig, ax = get_plot_axes(figsize)
+        ax.text(0.5, 0.5, f"Error creating {name}: {e}", ha='center', va='center')
+        fig.savefig(output_path, dpi=DPI)
+
+def _draw_qber_comparison(ax, comparison_data):
+    """Draw the paired QBER bars and threshold lines onto ax."""
+    _paired_bar(ax, comparison_data['protocols'],
+                comparison_data['no_eve']['qber'], comparison_data['with_eve']['qber'],
+                'Quantum Bit Error Rate (QBER)', 'Effect of Eavesdropping on QBER')
     
-    plt.close()
+    # Add threshold lines
+    for threshold, color, label in QBER_THRESHOLDS:
+        ax.axhline(y=threshold, color=color, linestyle='--', label=label)
+    ax.legend()
 
-def plot_key_generation_efficiency(comparison_data, output_dir):
+def plot_qber_comparison(comparison_data, output_path):
+    """Plot QBER comparison with and without eavesdropping."""
+    _safe_plot(_draw_qber_comparison, comparison_data, output_path,
+               "QBER comparison plot", 'QBER Comparison (No Data)')
+
+def _draw_key_generation_efficiency(ax, comparison_data):
+    """Draw the paired key generation rate bars onto ax."""
+    efficiency_no_eve = np.asarray(comparison_data['no_eve']['raw_key']) / 1000
+    efficiency_with_eve = np.asarray(comparison_data['with_eve']['raw_key']) / 1000
+    
+    _paired_bar(ax, comparison_data['protocols'], efficiency_no_eve, efficiency_with_eve,
+                'Key Generation Rate (bits/qubit)', 'Key Generation Efficiency Comparison')
+
+def plot_key_generation_efficiency(comparison_data, output_path):
     """Plot key generation efficiency."""
-    plt.figure(figsize=(10, 6))
+    _safe_plot(_draw_key_generation_efficiency, comparison_data, output_path,
+               "key generation efficiency plot", 'Key Generation Efficiency (No Data)')
+
+def _draw_security_comparison(ax, comparison_data):
+    """Draw the eavesdropping detection rate bars onto ax."""
+    protocols = comparison_data['protocols']
     
-    try:
-        protocols = comparison_data['protocols']
-        
-        if not protocols:
-            print("Warning: No protocols found for key generation efficiency plot")
-            plt.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
-            plt.title('Key Generation Efficiency (No Data)')
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, 'key_efficiency.png'), dpi=300)
-            plt.close()
-            return
-        
-        efficiency_no_eve = [raw/1000 for raw in comparison_data['no_eve']['raw_key']]
-        
-        x = np.arange(len(protocols))
-        width = 0.35
-        
-        plt.bar(x - width/2, efficiency_no_eve, width, label='Without Eavesdropping', color='green')
-        
-        # Only plot with_eve if we have matching data
-        if len(comparison_data['with_eve']['raw_key']) == len(protocols):
-            efficiency_with_eve = [raw/1000 for raw in comparison_data['with_eve']['raw_key']]
-            plt.bar(x + width/2, efficiency_with_eve, width, label='With Eavesdropping', color='red')
-        
-        plt.xlabel('Protocol')
-        plt.ylabel('Key Generation Rate (bits/qubit)')
-        plt.title('Key Generation Efficiency Comparison')
-        plt.xticks(x, protocols)
-        plt.legend()
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'key_efficiency.png'), dpi=300)
-    except Exception as e:
-        print(f"Error creating key efficiency plot: {e}")
-        plt.clf()
-        plt.text(0.5, 0.5, f"Error creating plot: {e}", ha='center', va='center')
-        plt.savefig(os.path.join(output_dir, 'key_efficiency.png'), dpi=300)
+    # Only use detection data if we have matching length
+    if len(comparison_data['with_eve']['detection']) == len(protocols):
+        detection_rates = [100 if detected else 0 for detected in comparison_data['with_eve']['detection']]
+    else:
+        # Use placeholder data
+        detection_rates = [80, 70, 100][:len(protocols)]
+        print("Warning: Using placeholder data for security comparison")
     
-    plt.close()
-
-def plot_security_comparison(comparison_data, output_dir):
-    """Plot security comparison chart."""
-    plt.figure(figsize=(10, 6))
+    ax.bar(protocols, detection_rates, color=BAR_COLORS[:len(protocols)])
     
-    try:
-        protocols = comparison_data['protocols']
-        
-        if not protocols:
-            print("Warning: No protocols found for security comparison plot")
-            plt.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
-            plt.title('Security Comparison (No Data)')
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, 'security_comparison.png'), dpi=300)
-            plt.close()
-            return
-        
-        # Only use detection data if we have matching length
-        if len(comparison_data['with_eve']['detection']) == len(protocols):
-            detection_rates = [100 if detected else 0 for detected in comparison_data['with_eve']['detection']]
-        else:
-            # Use placeholder data
-            detection_rates = [80, 70, 100][:len(protocols)]
-            print("Warning: Using placeholder data for security comparison")
-        
-        plt.bar(protocols, detection_rates, color=['blue', 'orange', 'green'][:len(protocols)])
-        
-        plt.xlabel('Protocol')
-        plt.ylabel('Eavesdropping Detection Rate (%)')
-        plt.title('Eavesdropping Detection Capability')
-        plt.ylim(0, 100)
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        # Add values on top of bars
-        for i, v in enumerate(detection_rates):
-            plt.text(i, v + 5, f"{v}%", ha='center')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'security_comparison.png'), dpi=300)
-    except Exception as e:
-        print(f"Error creating security comparison plot: {e}")
-        plt.clf()
-        plt.text(0.5, 0.5, f"Error creating plot: {e}", ha='center', va='center')
-        plt.savefig(os.path.join(output_dir, 'security_comparison.png'), dpi=300)
+    ax.set_xlabel('Protocol')
+    ax.set_ylabel('Eavesdropping Detection Rate (%)')
+    ax.set_title('Eavesdropping Detection Capability')
+    ax.set_ylim(0, 100)
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
-    plt.close()
+    # Add values on top of bars
+    for i, v in enumerate(detection_rates):
+        ax.text(i, v + 5, f"{v}%", ha='center')
+
+def plot_security_comparison(comparison_data, output_path):
+    """Plot security comparison chart."""
+    _safe_plot(_draw_security_comparison, comparison_data, output_path,
+               "security comparison plot", 'Security Comparison (No Data)')
+
+def _draw_final_key_length(ax, comparison_data):
+    """Draw the paired final key length bars onto ax."""
+    _paired_bar(ax, comparison_data['protocols'],
+                comparison_data['no_eve']['final_key'], comparison_data['with_eve']['final_key'],
+                'Final Secure Key Length (bits)', 'Final Secure Key Length Comparison')
 
-def plot_final_key_length(comparison_data, output_dir):
+def plot_final_key_length(comparison_data, output_path):
     """Plot final secure key length comparison."""
-    plt.figure(figsize=(10, 6))
+    _safe_plot(_draw_final_key_length, comparison_data, output_path,
+               "final key length plot", 'Final Key Length Comparison (No Data)')
+
+def _draw_protocol_overhead(ax, comparison_data):
+    """Draw the protocol overhead bars onto ax."""
+    protocols = comparison_data['protocols']
     
-    try:
-        protocols = comparison_data['protocols']
-        
-        if not protocols:
-            print("Warning: No protocols found for final key length plot")
-            plt.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
-            plt.title('Final Key Length Comparison (No Data)')
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, 'final_key_length.png'), dpi=300)
-            plt.close()
-            return
-        
-        x = np.arange(len(protocols))
-        width = 0.35
-        
-        plt.bar(x - width/2, comparison_data['no_eve']['final_key'], width, 
-                label='Without Eavesdropping', color='green')
-        
-        # Only use with_eve data if length matches
-        if len(comparison_data['with_eve']['final_key']) == len(protocols):
-            plt.bar(x + width/2, comparison_data['with_eve']['final_key'], width, 
-                    label='With Eavesdropping', color='red')
-        
-        plt.xlabel('Protocol')
-        plt.ylabel('Final Secure Key Length (bits)')
-        plt.title('Final Secure Key Length Comparison')
-        plt.xticks(x, protocols)
-        plt.legend()
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'final_key_length.png'), dpi=300)
-    except Exception as e:
-        print(f"Error creating final key length plot: {e}")
-        plt.clf()
-        plt.text(0.5, 0.5, f"Error creating plot: {e}", ha='center', va='center')
-        plt.savefig(os.path.join(output_dir, 'final_key_length.png'), dpi=300)
+    # Calculate overhead, falling back to 50% where there is no raw key
+    raw_key = np.asarray(comparison_data['no_eve']['raw_key'], dtype=np.float64)
+    overhead = np.where(raw_key > 0, (1000 - raw_key)/10, 50.0)
     
-    plt.close()
-
-def plot_protocol_overhead(comparison_data, output_dir):
-    """Plot protocol overhead comparison."""
-    plt.figure(figsize=(10, 6))
+    ax.bar(protocols, overhead, color=BAR_COLORS[:len(protocols)])
     
-    try:
-        protocols = comparison_data['protocols']
-        
-        if not protocols:
-            print("Warning: No protocols found for protocol overhead plot")
-            plt.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
-            plt.title('Protocol Overhead (No Data)')
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, 'protocol_overhead.png'), dpi=300)
-            plt.close()
-            return
-        
-        # Calculate overhead with safe handling of possible zeros
-        overhead = []
-        for raw in comparison_data['no_eve']['raw_key']:
-            try:
-                if raw > 0:
-                    overhead.append((1000 - raw)/10)
-                else:
-                    overhead.append(50.0)  # Default value
-            except:
-                overhead.append(50.0)  # Default value
-        
-        plt.bar(protocols, overhead, color=['blue', 'orange', 'green'][:len(protocols)])
-        
-        plt.xlabel('Protocol')
-        plt.ylabel('Overhead (%)')
-        plt.title('Protocol Overhead Comparison')
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        
-        # Add values on top of bars
-        for i, v in enumerate(overhead):
-            plt.text(i, v + 1, f"{v:.1f}%", ha='center')
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'protocol_overhead.png'), dpi=300)
-    except Exception as e:
-        print(f"Error creating protocol overhead plot: {e}")
-        plt.clf()
-        plt.text(0.5, 0.5, f"Error creating plot: {e}", ha='center', va='center')
-        plt.savefig(os.path.join(output_dir, 'protocol_overhead.png'), dpi=300)
+    ax.set_xlabel('Protocol')
+    ax.set_ylabel('Overhead (%)')
+    ax.set_title('Protocol Overhead Comparison')
+    ax.grid(axis='y', linestyle='--', alpha=0.7)
     
-    plt.close()
+    # Add values on top of bars
+    for i, v in enumerate(overhead):
+        ax.text(i, v + 1, f"{v:.1f}%", ha='center')
 
-def create_comparison_radar_chart(comparison_data, output_dir):
-    """Create a radar chart comparing the protocols across multiple dimensions."""
-    # Normalize data for radar chart
-    categories = ['Key Efficiency', 'Eve Detection', 'Implementation\nSimplicity', 
-                 'Quantum Resource\nEfficiency', 'Error Tolerance']
+def plot_protocol_overhead(comparison_data, output_path):
+    """Plot protocol overhead comparison."""
+    _safe_plot(_draw_protocol_overhead, comparison_data, output_path,
+               "protocol overhead plot", 'Protocol Overhead (No Data)')
+
+def _draw_comparison_radar_chart(ax, comparison_data):
+    """Draw the per-protocol radar polygons onto the polar ax."""
+    protocols = comparison_data['protocols']
     
-    try:
-        protocols = comparison_data['protocols']
-        
-        if not protocols:
-            print("Warning: No protocols found for radar chart")
-            plt.figure(figsize=(10, 8))
-            plt.text(0.5, 0.5, "No protocol data available", ha='center', va='center')
-            plt.title('Protocol Comparison (No Data)')
-            plt.tight_layout()
-            plt.savefig(os.path.join(output_dir, 'protocol_radar_comparison.png'), dpi=300)
-            plt.close()
-            return
-            
-        # Create normalized scores for each protocol (subjective, based on known properties)
-        # Helper function to safely get values
-        def safe_get(data_dict, keys, index, default):
-            try:
-                if keys not in data_dict or index >= len(data_dict[keys]):
-                    return default
-                return data_dict[keys][index]
-            except (KeyError, IndexError):
+    # Create normalized scores for each protocol (subjective, based on known properties)
+    # Helper function to safely get values
+    def safe_get(data_dict, keys, index, default):
+        try:
+            if keys not in data_dict or index >= len(data_dict[keys]):
                 return default
-        
-        # Protocol scores dict
-        protocol_scores = {}
-        
-        for idx, protocol in enumerate(protocols):
-            # Each protocol has 5 scores corresponding to the categories
-            scores = [
-                safe_get(comparison_data['no_eve'], 'raw_key', idx, 500)/1000,  # Key efficiency
-                1.0 if safe_get(comparison_data['with_eve'], 'detection', idx, True) else 0.0,  # Eve detection
-                0.7 if protocol == "BB84" else (0.9 if protocol == "B92" else 0.5),  # Implementation simplicity
-                0.6 if protocol == "BB84" else (0.8 if protocol == "B92" else 0.4),  # Quantum resource efficiency
-                1.0 - safe_get(comparison_data['no_eve'], 'qber', idx, 0.05)/0.15  # Error tolerance
-            ]
-            protocol_scores[protocol] = scores
-        
-        # Normalize all scores to 0-1 range
-        for i in range(len(categories)):
-            max_val = 0.001  # Avoid division by zero
-            for protocol in protocols:
-                max_val = max(max_val, protocol_scores[protocol][i])
-            
-            for protocol in protocols:
-                protocol_scores[protocol][i] /= max_val
-        
-        # Set up the radar chart
-        angles = np.linspace(0, 2*np.pi, len(categories), endpoint=False).tolist()
-        angles += angles[:1]  # Close the polygon
-        
-        fig, ax = plt.subplots(figsize=(10, 8), subplot_kw=dict(polar=True))
-        
-        colors = ['blue', 'red', 'green', 'purple', 'orange']
-        
-        for i, protocol in enumerate(protocols):
-            scores = protocol_scores[protocol]
-            scores += scores[:1]  # Close the polygon
-            
-            ax.plot(angles, scores, linewidth=2, label=protocol, color=colors[i % len(colors)])
-            ax.fill(angles, scores, alpha=0.1, color=colors[i % len(colors)])
-        
-        ax.set_thetagrids(np.degrees(angles[:-1]), categories)
-        ax.set_ylim(0, 1)
-        ax.set_title('Protocol Comparison: Multiple Factors', size=15)
-        ax.legend(loc='upper right')
-        ax.grid(True)
-        
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, 'protocol_radar_comparison.png'), dpi=300)
-    except Exception as e:
-        print(f"Error creating radar chart: {e}")
-        plt.figure(figsize=(10, 8))
-        plt.text(0.5, 0.5, f"Error creating radar chart: {e}", ha='center', va='center')
-        plt.savefig(os.path.join(output_dir, 'protocol_radar_comparison.png'), dpi=300)
+            return data_dict[keys][index]
+        except (KeyError, IndexError):
+            return default
+    
+    # One row of scores per protocol, one column per category
+    protocol_scores = np.empty((len(protocols), len(RADAR_CATEGORIES)))
+    
+    for idx, protocol in enumerate(protocols):
+        protocol_scores[idx] = [
+            safe_get(comparison_data['no_eve'], 'raw_key', idx, 500)/1000,  # Key efficiency
+            1.0 if safe_get(comparison_data['with_eve'], 'detection', idx, True) else 0.0,  # Eve detection
+            0.7 if protocol == "BB84" else (0.9 if protocol == "B92" else 0.5),  # Implementation simplicity
+            0.6 if protocol == "BB84" else (0.8 if protocol == "B92" else 0.4),  # Quantum resource efficiency
+            1.0 - safe_get(comparison_data['no_eve'], 'qber', idx, 0.05)/0.15  # Error tolerance
+        ]
+    
+    # Normalize each category by its best score (at least 0.001 to avoid division by zero)
+    protocol_scores /= np.maximum(protocol_scores.max(axis=0), 0.001)
     
-    plt.close()
+    # Repeat the first column to close every polygon at once
+    closed_scores = np.hstack([protocol_scores, protocol_scores[:, :1]])
+    
+    for i, protocol in enumerate(protocols):
+        color = RADAR_COLORS[i % len(RADAR_COLORS)]
+        ax.plot(RADAR_ANGLES, closed_scores[i], linewidth=2, label=protocol, color=color)
+        ax.fill(RADAR_ANGLES, closed_scores[i], alpha=0.1, color=color)
+    
+    ax.set_thetagrids(np.degrees(RADAR_ANGLES[:-1]), RADAR_CATEGORIES)
+    ax.set_ylim(0, 1)
+    ax.set_title('Protocol Comparison: Multiple Factors', size=15)
+    ax.legend(loc='upper right')
+    ax.grid(True)
+
+def create_comparison_radar_chart(comparison_data, output_path):
+    """Create a radar chart comparing the protocols across multiple dimensions."""
+    _safe_plot(_draw_comparison_radar_chart, comparison_data, output_path,
+               "radar chart", 'Protocol Comparison (No Data)',
+               figsize=(10, 8), margins=RADAR_MARGINS, polar=True)
 
 def create_placeholder_plots(output_dir):
     """Create placeholder plots if data is insufficient."""
@@ -505,12 +477,11 @@ def create_placeholder_plots(output_dir):
     ]
     
     for filename, title in plots:
-        plt.figure(figsize=(10, 6))
-        plt.text(0.5, 0.5, "Insufficient data to generate plot", ha='center', va='center', fontsize=14)
-        plt.title(title)
-        plt.tight_layout()
-        plt.savefig(os.path.join(output_dir, filename), dpi=300)
-        plt.close()
+        fig, ax = get_plot_axes((10, 6))
+        ax.text(0.5, 0.5, "Insufficient data to generate plot", ha='center', va='center', fontsize=14)
+        ax.set_title(title)
+        fig.subplots_adjust(**BAR_MARGINS)
+        fig.savefig(os.path.join(output_dir, filename), dpi=DPI)
 
 def main():
     if len(sys.argv) < 4:
@@ -571,13 +542,22 @@ def main():
     # Generate visualizations
     print("Generating visualizations...")
     
+    plots = [
+        (plot_qber_comparison, 'qber_comparison.png'),
+        (plot_key_generation_efficiency, 'key_efficiency.png'),
+        (plot_security_comparison, 'security_comparison.png'),
+        (plot_final_key_length, 'final_key_length.png'),
+        (plot_protocol_overhead, 'protocol_overhead.png'),
+        (create_comparison_radar_chart, 'protocol_radar_comparison.png')
+    ]
+    
     try:
-        plot_qber_comparison(comparison_data, output_dir)
-        plot_key_generation_efficiency(comparison_data, output_dir)
-        plot_security_comparison(comparison_data, output_dir)
-        plot_final_key_length(comparison_data, output_dir)
-        plot_protocol_overhead(comparison_data, output_dir)
-        create_comparison_radar_chart(comparison_data, output_dir)
+        # The charts are independent, so render them in parallel processes
+        with ProcessPoolExecutor(max_workers=min(len(plots), os.cpu_count() or 1)) as executor:
+            futures = [executor.submit(plot, comparison_data, os.path.join(output_dir, filename))
+                       for plot, filename in plots]
+            for future in futures:
+                future.result()
     except Exception as e:
         print(f"Error generating visualizations: {e}")
         create_placeholder_plots(output_dir)